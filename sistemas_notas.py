@@ -5,6 +5,18 @@ import tkinter as tk # Biblioteca para criar janelas e interface gráfica
 from tkinter import ttk, messagebox # Componentes extras da interface
 import hashlib # Para criptografar senhas
 from datetime import datetime # Para trabalhar com datas
+import os # Para manipular arquivos do snapshot
+import sys # Para ler argumentos da linha de comando
+import json # Para gravar os metadados do snapshot
+import re # Para validar o nome das escolas
+import time # Para controlar conexões ociosas
+from pathlib import Path # Para montar o endereço (URI) dos bancos
+from concurrent.futures import ProcessPoolExecutor # Para consultar várias escolas em paralelo
+
+try:
+    import numpy as np # Opcional: usado apenas no snapshot colunar de notas
+except ImportError:
+    np = None
 
 
 # ============ 📌 Classe principal do sistema ============
@@ -12,14 +24,88 @@ from datetime import datetime # Para trabalhar com datas
 # - Essa classe gerencia o banco de dados, usuários e regras do sistema.
 
 class SistemaNotas:
-    def __init__(self):
-        self.conn = sqlite3.connect('sistema_notas.db')  # Conexão com o banco
-        self.cursor = self.conn.cursor()                 # Manipulador SQL
-        self.criar_tabelas()                             # Cria tabelas se não existirem
-        self.criar_usuarios_padrao()                     # Cria usuário inicial "secretaria"
+    _modelo = None  # Banco em memória com as tabelas já criadas (ver em_memoria)
+
+    def __init__(self, caminho_banco='sistema_notas.db', conexao=None):
+        """
+        Args:
+            caminho_banco: arquivo do banco, ':memory:' ou URI do SQLite
+                           (ex: 'file:escola?mode=memory&cache=shared')
+            conexao: conexão já pronta com as tabelas criadas (ex: cópia do
+                     banco modelo); nesse caso o banco não é reinicializado
+        """
+        self.caminho_banco = caminho_banco               # Local do banco (um por escola)
+        self.ultimo_uso = time.monotonic()               # Atualizado a cada acesso ao banco
+        self._cursor = None
+        if conexao is None:
+            self._conn = self._conectar()                # Conexão com o banco
+            self.criar_tabelas()                         # Cria tabelas se não existirem
+            self.criar_usuarios_padrao()                 # Cria usuário inicial "secretaria"
+        else:
+            self._conn = conexao
         self.usuario_logado = None                       # Armazena o ID do usuário autenticado
         self.tipo_usuario = None                         # Armazena o tipo (secretaria, professor, aluno)
 
+    def _conectar(self):
+        # Aceita str ou pathlib.Path; só textos 'file:...' são tratados como URI
+        return sqlite3.connect(self.caminho_banco, uri=str(self.caminho_banco).startswith('file:'))
+
+    def _em_memoria(self):
+        """Bancos em memória somem ao fechar a conexão, então não podem ser reabertos"""
+        caminho = str(self.caminho_banco)
+        return caminho == ':memory:' or 'mode=memory' in caminho
+
+    @property
+    def conn(self):
+        """Conexão com o banco (reaberta automaticamente se foi fechada por ociosidade)"""
+        self.ultimo_uso = time.monotonic()
+        if self._conn is None:
+            if self._em_memoria():
+                raise sqlite3.ProgrammingError("Banco em memória já foi fechado!")
+            self._conn = self._conectar()
+        return self._conn
+
+    @property
+    def cursor(self):
+        """Manipulador SQL da conexão atual"""
+        conn = self.conn
+        if self._cursor is None or self._cursor.connection is not conn:
+            self._cursor = conn.cursor()
+        return self._cursor
+
+    def conectado(self):
+        """Indica se a conexão com o banco está aberta"""
+        return self._conn is not None
+
+    def ocioso(self, segundos):
+        """Indica se a conexão está aberta, sem transação pendente e sem uso há `segundos`"""
+        return (self._conn is not None and not self._conn.in_transaction
+                and time.monotonic() - self.ultimo_uso >= segundos)
+
+    def fechar(self):
+        """
+        Fecha a conexão com o banco.
+        Bancos em arquivo são reabertos sozinhos no próximo acesso.
+        """
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            self._cursor = None
+
+    @classmethod
+    def em_memoria(cls):
+        """
+        Cria um sistema com banco em memória, já com tabelas e usuário padrão.
+        O esquema é montado uma única vez em um banco modelo e copiado para
+        cada novo banco com a API de backup do SQLite (ideal para testes:
+        cada chamada devolve um banco novo e isolado).
+        """
+        if cls._modelo is None:
+            cls._modelo = cls(':memory:').conn
+
+        conn = sqlite3.connect(':memory:')
+        cls._modelo.backup(conn)
+        return cls(':memory:', conexao=conn)
         
     def criar_tabelas(self):                             # Essa função cria 4 tabelas: usuários, alunos, professores e notas. 
         # Tabela de usuários
@@ -69,9 +155,95 @@ class SistemaNotas:
                 FOREIGN KEY (professor_id) REFERENCES professores(id)
             )
         ''')
+
+        # Índices usados pela matriz de notas (busca por turma e JOIN com notas)
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_alunos_turma ON alunos (turma)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_notas_aluno ON notas (aluno_id)')
+
+        # Tabela de frequência: uma linha por (aluno, disciplina, período) com as
+        # presenças compactadas em bits (bit i = 1 → presente na aula i).
+        # Só contam as aulas de 'inicio' até 'aulas' - 1: aulas anteriores à
+        # entrada do aluno na turma não viram falta
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS frequencias (
+                aluno_id INTEGER NOT NULL,
+                disciplina TEXT NOT NULL,
+                periodo TEXT NOT NULL,
+                presencas BLOB NOT NULL,
+                inicio INTEGER NOT NULL DEFAULT 0,
+                aulas INTEGER NOT NULL,
+                PRIMARY KEY (aluno_id, disciplina, periodo),
+                FOREIGN KEY (aluno_id) REFERENCES alunos(id)
+            )
+        ''')
+
+        # Bancos criados antes da coluna 'inicio' existir
+        self.cursor.execute('PRAGMA table_info(frequencias)')
+        if 'inicio' not in [row[1] for row in self.cursor.fetchall()]:
+            self.cursor.execute('ALTER TABLE frequencias ADD COLUMN inicio INTEGER NOT NULL DEFAULT 0')
+
+        # Quantidade de aulas com chamada de cada turma em cada disciplina/período
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chamadas (
+                turma TEXT NOT NULL,
+                disciplina TEXT NOT NULL,
+                periodo TEXT NOT NULL,
+                aulas INTEGER NOT NULL,
+                PRIMARY KEY (turma, disciplina, periodo)
+            )
+        ''')
+
+        # Registro de alterações do snapshot: se nenhum snapshot foi gerado há
+        # muito tempo, o registro só cresceria; descarta-o (o próximo snapshot
+        # é refeito por completo)
+        if self.registro_alteracoes_ativo():
+            self.cursor.execute('SELECT MAX(id) - MIN(id) FROM notas_alteracoes')
+            tamanho = self.cursor.fetchone()[0] or 0
+            if tamanho > self.LIMITE_REGISTRO_ALTERACOES:
+                self.desativar_registro_alteracoes()
         
         self.conn.commit()
     
+    # Gatilhos que alimentam o registro de alterações do snapshot: mudanças na
+    # nota, na turma do aluno ou no nome do professor alteram linhas do snapshot
+    GATILHOS_REGISTRO = {
+        'trg_notas_insert': "AFTER INSERT ON notas BEGIN INSERT INTO notas_alteracoes (nota_id) VALUES (NEW.id); END",
+        'trg_notas_update': "AFTER UPDATE ON notas BEGIN INSERT INTO notas_alteracoes (nota_id) VALUES (NEW.id); END",
+        'trg_notas_delete': "AFTER DELETE ON notas BEGIN INSERT INTO notas_alteracoes (nota_id) VALUES (OLD.id); END",
+        'trg_alunos_update': "AFTER UPDATE OF turma ON alunos BEGIN INSERT INTO notas_alteracoes (nota_id) SELECT id FROM notas WHERE aluno_id = NEW.id; END",
+        'trg_alunos_delete': "AFTER DELETE ON alunos BEGIN INSERT INTO notas_alteracoes (nota_id) SELECT id FROM notas WHERE aluno_id = OLD.id; END",
+        'trg_professores_update': "AFTER UPDATE OF nome ON professores BEGIN INSERT INTO notas_alteracoes (nota_id) SELECT id FROM notas WHERE professor_id = NEW.id; END",
+        'trg_professores_delete': "AFTER DELETE ON professores BEGIN INSERT INTO notas_alteracoes (nota_id) SELECT id FROM notas WHERE professor_id = OLD.id; END",
+    }
+    LIMITE_REGISTRO_ALTERACOES = 500000  # Acima disso o registro é descartado
+
+    def registro_alteracoes_ativo(self):
+        """Indica se o registro de alterações (usado pelo snapshot) está ligado"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notas_alteracoes'")
+        return self.cursor.fetchone() is not None
+
+    def ativar_registro_alteracoes(self):
+        """
+        Cria a tabela notas_alteracoes e os gatilhos que a alimentam.
+        Só é chamado pelo snapshot: bancos sem snapshot não pagam esse custo.
+        """
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS notas_alteracoes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nota_id INTEGER NOT NULL
+            )
+        ''')
+        for nome, corpo in self.GATILHOS_REGISTRO.items():
+            self.cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {nome} {corpo}')
+        self.conn.commit()
+
+    def desativar_registro_alteracoes(self):
+        """Remove os gatilhos e a tabela notas_alteracoes"""
+        for nome in self.GATILHOS_REGISTRO:
+            self.cursor.execute(f'DROP TRIGGER IF EXISTS {nome}')
+        self.cursor.execute('DROP TABLE IF EXISTS notas_alteracoes')
+        self.conn.commit()
+
     def gerar_matricula(self):
         """Gera matrícula automática no formato: ANO + SEQUENCIAL (ex: 2025001)"""
         ano = datetime.now().year
@@ -120,7 +292,7 @@ class SistemaNotas:
             ''', ('secretaria', senha_hash, 'secretaria', 'Secretaria'))
             self.conn.commit()
         except sqlite3.IntegrityError:
-            pass
+            self.conn.rollback()  # Já existe; não deixa a transação aberta
     
     def autenticar(self, usuario, senha):                       # Método responsável por autenticar login
         senha_hash = hashlib.md5(senha.encode()).hexdigest()    # Transforma a senha digitada em hash
@@ -136,11 +308,965 @@ class SistemaNotas:
             return True
         return False
 
+    @staticmethod
+    def hash_senha(senha):
+        """Criptografa a senha em MD5 (mesmo formato usado no login)"""
+        return hashlib.md5(senha.encode()).hexdigest()
+
+    def _cadastrar_usuario_vinculado(self, tipo, nome, usuario, senha, sql, valores):
+        """
+        Cria o usuário de login e o registro vinculado a ele (aluno ou professor)
+        na mesma transação: se um falhar (ex: usuário repetido), nada é gravado.
+        """
+        try:
+            self.cursor.execute('''
+                INSERT INTO usuarios (usuario, senha, tipo, nome)
+                VALUES (?, ?, ?, ?)
+            ''', (usuario, self.hash_senha(senha), tipo, nome))
+            usuario_id = self.cursor.lastrowid  # ID do usuário recém-criado
+            self.cursor.execute(sql, (*valores, usuario_id))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def cadastrar_aluno(self, nome, turma, usuario, senha):
+        """
+        Cadastra um aluno no banco de dados.
+        Processo:
+        1. Gera matrícula automática
+        2. Cria registro na tabela 'usuarios' (com senha em MD5)
+        3. Cria registro na tabela 'alunos' vinculado ao usuário
+        Retorna a matrícula gerada.
+        """
+        matricula = self.gerar_matricula()
+        self._cadastrar_usuario_vinculado('aluno', nome, usuario, senha, '''
+            INSERT INTO alunos (matricula, nome, turma, usuario_id)
+            VALUES (?, ?, ?, ?)
+        ''', (matricula, nome, turma))
+        return matricula
+
+    def cadastrar_professor(self, nome, disciplina, usuario, senha):
+        """
+        Cadastra professor no banco de dados (processo similar ao do aluno).
+        Retorna o código gerado.
+        """
+        codigo = self.gerar_codigo_professor()
+        self._cadastrar_usuario_vinculado('professor', nome, usuario, senha, '''
+            INSERT INTO professores (codigo, nome, disciplina, usuario_id)
+            VALUES (?, ?, ?, ?)
+        ''', (codigo, nome, disciplina))
+        return codigo
+
+    def excluir_aluno(self, aluno_id):
+        """Exclui o aluno pelo ID"""
+        self.cursor.execute('DELETE FROM alunos WHERE id = ?', (aluno_id,))
+        self.conn.commit()
+
+    def excluir_professor(self, prof_id):
+        """Exclui o professor pelo ID"""
+        self.cursor.execute('DELETE FROM professores WHERE id = ?', (prof_id,))
+        self.conn.commit()
+
+    def listar_alunos(self):
+        """Lista (id, matricula, nome, turma) dos alunos, mais recentes primeiro"""
+        self.cursor.execute('SELECT id, matricula, nome, turma FROM alunos ORDER BY id DESC')
+        return self.cursor.fetchall()
+
+    def listar_professores(self):
+        """Lista (id, codigo, nome, disciplina) dos professores, mais recentes primeiro"""
+        self.cursor.execute('SELECT id, codigo, nome, disciplina FROM professores ORDER BY id DESC')
+        return self.cursor.fetchall()
+
+    def alunos_da_turma(self, turma):
+        """Lista (id, matricula, nome) dos alunos da turma em ordem alfabética"""
+        self.cursor.execute('''
+            SELECT id, matricula, nome FROM alunos
+            WHERE turma = ? ORDER BY nome
+        ''', (turma,))
+        return self.cursor.fetchall()
+
+    def buscar_professor(self, usuario_id):
+        """Retorna (id, nome, disciplina) do professor ligado ao usuário, ou None"""
+        self.cursor.execute('''
+            SELECT id, nome, disciplina FROM professores
+            WHERE usuario_id = ?
+        ''', (usuario_id,))
+        return self.cursor.fetchone()
+
+    def buscar_aluno(self, usuario_id):
+        """Retorna (id, nome, matricula, turma) do aluno ligado ao usuário, ou None"""
+        self.cursor.execute('''
+            SELECT id, nome, matricula, turma FROM alunos
+            WHERE usuario_id = ?
+        ''', (usuario_id,))
+        return self.cursor.fetchone()
+
+    # ========== NOTAS ==========
+
+    def lancar_nota(self, aluno_id, disciplina, professor_id, nota):
+        """
+        Lança ou atualiza nota de um aluno.
+        - Verifica se nota já existe (atualiza)
+        - Se não existe, insere nova nota
+        - Valida se nota está entre 0 e 10
+        Retorna True se a nota foi inserida, False se foi atualizada.
+        """
+        if nota < 0 or nota > 10:
+            raise ValueError("Nota deve estar entre 0 e 10!")
+
+        # Verifica se já existe nota para este aluno nesta disciplina
+        self.cursor.execute('''
+            SELECT id FROM notas
+            WHERE aluno_id = ? AND disciplina = ? AND professor_id = ?
+        ''', (aluno_id, disciplina, professor_id))
+        existe = self.cursor.fetchone()
+
+        if existe:
+            # Atualiza nota existente
+            self.cursor.execute('''
+                UPDATE notas SET nota = ?
+                WHERE aluno_id = ? AND disciplina = ? AND professor_id = ?
+            ''', (nota, aluno_id, disciplina, professor_id))
+        else:
+            # Insere nova nota
+            self.cursor.execute('''
+                INSERT INTO notas (aluno_id, disciplina, nota, professor_id)
+                VALUES (?, ?, ?, ?)
+            ''', (aluno_id, disciplina, nota, professor_id))
+
+        self.conn.commit()
+        return not existe
+
+    def notas_da_disciplina(self, disciplina, professor_id):
+        """
+        Lista (matricula, nome, turma, nota) de TODOS os alunos.
+        Usa LEFT JOIN para incluir alunos sem nota (nota '-').
+        """
+        self.cursor.execute('''
+            SELECT a.matricula, a.nome, a.turma, COALESCE(n.nota, '-') as nota
+            FROM alunos a
+            LEFT JOIN notas n ON a.id = n.aluno_id 
+                AND n.disciplina = ? AND n.professor_id = ?
+            ORDER BY a.nome
+        ''', (disciplina, professor_id))
+        return self.cursor.fetchall()
+
+    def notas_do_aluno(self, aluno_id):
+        """Lista (disciplina, nota, nome do professor) das notas do aluno"""
+        self.cursor.execute('''
+            SELECT n.disciplina, n.nota, p.nome
+            FROM notas n
+            JOIN professores p ON n.professor_id = p.id
+            WHERE n.aluno_id = ?
+            ORDER BY n.disciplina
+        ''', (aluno_id,))
+        return self.cursor.fetchall()
+
+    def listar_turmas(self):
+        """Retorna as turmas cadastradas em ordem alfabética"""
+        self.cursor.execute('SELECT DISTINCT turma FROM alunos ORDER BY turma')
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def buscar_matriz_notas(self, turma=None):
+        """
+        Monta a matriz alunos × disciplinas de uma turma (ou da escola inteira
+        quando turma=None) com uma única consulta.
+        Cada coluna é uma disciplina de um professor, já que a nota é
+        lançada por professor (dois professores de Matemática = duas colunas).
+        Retorna (alunos, colunas, valores), onde:
+        - alunos: lista de (id, matricula, nome)
+        - colunas: lista de (disciplina, professor_id, nome do professor, editavel);
+          colunas de professores excluídos não são editáveis
+        - valores[i][j]: nota do aluno i na coluna j (None se não lançada)
+        """
+        # Colunas: todos os professores, mesmo sem nota lançada ainda
+        self.cursor.execute('SELECT disciplina, id, nome, 1 FROM professores')
+        colunas = {(*row[:3], True) for row in self.cursor.fetchall()}
+        professores = {c[1] for c in colunas}
+
+        # Pivot: uma linha por nota; LEFT JOIN mantém alunos sem nota
+        filtro = 'WHERE a.turma = ?' if turma is not None else ''
+        self.cursor.execute(f'''
+            SELECT a.id, a.matricula, a.nome, n.disciplina, n.professor_id,
+                   COALESCE(p.nome, '(excluído)'), n.nota
+            FROM alunos a
+            LEFT JOIN notas n ON n.aluno_id = a.id
+            LEFT JOIN professores p ON p.id = n.professor_id
+            {filtro}
+            ORDER BY a.nome, a.id
+        ''', (turma,) if turma is not None else ())
+        linhas = self.cursor.fetchall()
+
+        # Notas de professores já excluídos também ganham coluna (só leitura)
+        colunas.update((*row[3:6], row[4] in professores) for row in linhas
+                       if row[3] is not None)
+        colunas = sorted(colunas, key=lambda c: (c[0], c[2], c[1]))
+        indice = {(c[0], c[1]): j for j, c in enumerate(colunas)}
+
+        alunos = []
+        valores = []
+        for aluno_id, matricula, nome, disciplina, professor_id, _, nota in linhas:
+            if not alunos or alunos[-1][0] != aluno_id:
+                alunos.append((aluno_id, matricula, nome))
+                valores.append([None] * len(colunas))
+            if disciplina is not None:
+                valores[-1][indice[(disciplina, professor_id)]] = nota
+
+        return alunos, colunas, valores
+
+    def salvar_notas_lote(self, alteracoes):
+        """
+        Grava várias notas de uma vez, em uma única transação.
+        alteracoes: dicionário {(aluno_id, disciplina, professor_id): nota}
+        - Se o professor já lançou nota para o aluno, ela é atualizada
+        - Se não lançou, a nota é inserida em nome desse professor
+        - Professor excluído não recebe nota (ValueError)
+        """
+        # Valida tudo antes de gravar qualquer coisa
+        for nota in alteracoes.values():
+            if nota < 0 or nota > 10:
+                raise ValueError("Nota deve estar entre 0 e 10!")
+
+        self.cursor.execute('SELECT id FROM professores')
+        professores = {row[0] for row in self.cursor.fetchall()}
+        if any(professor_id not in professores for _, _, professor_id in alteracoes):
+            raise ValueError("Não é possível lançar nota de professor excluído!")
+
+        linhas = [(nota, aluno_id, disciplina, professor_id)
+                  for (aluno_id, disciplina, professor_id), nota in alteracoes.items()]
+
+        try:
+            self.cursor.executemany('''
+                UPDATE notas SET nota = ?
+                WHERE aluno_id = ? AND disciplina = ? AND professor_id = ?
+            ''', linhas)
+
+            # Insere só onde o UPDATE não encontrou nota desse professor
+            self.cursor.executemany('''
+                INSERT INTO notas (nota, aluno_id, disciplina, professor_id)
+                SELECT ?1, ?2, ?3, ?4
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM notas
+                    WHERE aluno_id = ?2 AND disciplina = ?3 AND professor_id = ?4
+                )
+            ''', linhas)
+
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()  # Nada é gravado se alguma nota falhar
+            raise
+
+    @staticmethod
+    def periodo_atual():
+        """Período letivo atual no formato ANO.SEMESTRE (ex: 2025.1)"""
+        hoje = datetime.now()
+        return f"{hoje.year}.{1 if hoje.month <= 6 else 2}"
+
+    def proxima_aula(self, turma, disciplina, periodo=None):
+        """Número da próxima aula (0, 1, 2...) da turma na disciplina"""
+        self.cursor.execute('''
+            SELECT aulas FROM chamadas
+            WHERE turma = ? AND disciplina = ? AND periodo = ?
+        ''', (turma, disciplina, periodo or self.periodo_atual()))
+        resultado = self.cursor.fetchone()
+        return resultado[0] if resultado else 0
+
+    def registrar_chamada(self, turma, disciplina, presencas, aula=None, periodo=None):
+        """
+        Registra a chamada de uma aula da turma em uma única gravação.
+        presencas: dicionário {aluno_id: True (presente) / False (falta)}
+        aula: número da aula (0, 1, 2...); se None, usa a próxima aula da turma.
+              Uma aula já registrada pode ser informada para corrigir a chamada;
+              nesse caso alunos que entraram na turma depois dela são ignorados.
+        Retorna o número da aula registrada.
+        """
+        periodo = periodo or self.periodo_atual()
+        ids = list(presencas)
+        if not ids:
+            raise ValueError("Nenhum aluno na chamada!")
+
+        proxima = self.proxima_aula(turma, disciplina, periodo)
+        if aula is None:
+            aula = proxima
+        if aula < 0 or aula > proxima:
+            raise ValueError(f"Aula inválida! A próxima aula é a {proxima + 1}.")
+
+        # Lê de uma vez os bitsets atuais dos alunos da chamada
+        marcadores = ', '.join('?' * len(ids))
+        self.cursor.execute(f'''
+            SELECT aluno_id, presencas, inicio, aulas FROM frequencias
+            WHERE disciplina = ? AND periodo = ? AND aluno_id IN ({marcadores})
+        ''', (disciplina, periodo, *ids))
+        atuais = {row[0]: row[1:] for row in self.cursor.fetchall()}
+
+        # Liga/desliga o bit da aula em cada bitset
+        byte, bit = divmod(aula, 8)
+        linhas = []
+        for aluno_id, presente in presencas.items():
+            if aluno_id in atuais:
+                bits, inicio, aulas = atuais[aluno_id]
+            elif aula < proxima:
+                continue  # Correção: o aluno ainda não estava na turma nessa aula
+            else:
+                bits, inicio, aulas = b'', aula, aula  # Começa a contar a partir desta aula
+            if aula < inicio:
+                continue  # Aluno entrou na turma depois dessa aula
+            bits = bytearray(bits)
+            if len(bits) <= byte:
+                bits.extend(bytes(byte + 1 - len(bits)))
+            if presente:
+                bits[byte] |= 1 << bit
+            else:
+                bits[byte] &= ~(1 << bit) & 0xFF
+            linhas.append((aluno_id, disciplina, periodo, bytes(bits),
+                           inicio, max(aulas, aula + 1)))
+
+        try:
+            self.cursor.executemany('''
+                INSERT OR REPLACE INTO frequencias (aluno_id, disciplina, periodo, presencas, inicio, aulas)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', linhas)
+            self.cursor.execute('''
+                INSERT OR REPLACE INTO chamadas (turma, disciplina, periodo, aulas)
+                VALUES (?, ?, ?, ?)
+            ''', (turma, disciplina, periodo, max(proxima, aula + 1)))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return aula
+
+    def chamada_registrada(self, turma, disciplina, aula, periodo=None):
+        """
+        Retorna {aluno_id: True/False} com a presença de cada aluno da turma
+        em uma aula já registrada (alunos que ainda não estavam na turma ficam de fora).
+        """
+        self.cursor.execute('''
+            SELECT f.aluno_id, f.presencas
+            FROM frequencias f
+            JOIN alunos a ON a.id = f.aluno_id
+            WHERE a.turma = ? AND f.disciplina = ? AND f.periodo = ?
+              AND f.inicio <= ? AND f.aulas > ?
+        ''', (turma, disciplina, periodo or self.periodo_atual(), aula, aula))
+        byte, bit = divmod(aula, 8)
+        return {aluno_id: len(bits) > byte and bool(bits[byte] >> bit & 1)
+                for aluno_id, bits in self.cursor.fetchall()}
+
+    def frequencias_turma(self, turma, disciplina, periodo=None):
+        """Retorna {aluno_id: (presenças, aulas contadas)} dos alunos da turma na disciplina"""
+        self.cursor.execute('''
+            SELECT f.aluno_id, f.presencas, f.aulas - f.inicio
+            FROM frequencias f
+            JOIN alunos a ON a.id = f.aluno_id
+            WHERE a.turma = ? AND f.disciplina = ? AND f.periodo = ?
+        ''', (turma, disciplina, periodo or self.periodo_atual()))
+        return {aluno_id: (contar_presencas(bits), aulas)
+                for aluno_id, bits, aulas in self.cursor.fetchall()}
+
+    def frequencias_aluno(self, aluno_id, periodo=None):
+        """Retorna {disciplina: (presenças, aulas contadas)} do aluno no período"""
+        self.cursor.execute('''
+            SELECT disciplina, presencas, aulas - inicio FROM frequencias
+            WHERE aluno_id = ? AND periodo = ?
+        ''', (aluno_id, periodo or self.periodo_atual()))
+        return {disciplina: (contar_presencas(bits), aulas)
+                for disciplina, bits, aulas in self.cursor.fetchall()}
+
+# ============ 📌 Frequência (presenças compactadas em bits) ============
+
+FREQUENCIA_MINIMA = 0.75  # Frequência mínima para aprovação (75%)
+
+def contar_presencas(bits):
+    """Conta as presenças de um bitset (popcount do bloco inteiro de uma vez)"""
+    return int.from_bytes(bits, 'little').bit_count()
+
+def situacao_final(nota, presencas, aulas):
+    """Aprovado precisa de nota mínima E frequência mínima (se houver chamadas)"""
+    aprovado = nota >= NOTA_MINIMA_APROVACAO and (
+        aulas == 0 or presencas / aulas >= FREQUENCIA_MINIMA)
+    return 'Aprovado' if aprovado else 'Reprovado'
+
+def formatar_frequencia(presencas, aulas):
+    """Texto da frequência em porcentagem (ex: '87.5%'), ou '-' sem aulas"""
+    if aulas == 0:
+        return '-'
+    return f"{100 * presencas / aulas:.1f}%"
+
+# ============ 📌 Roteador de escolas (um banco por escola) ============
+
+ESCOLA_PADRAO = 'principal'  # Nome usado para o banco único (antes de haver escolas)
+
+def _consultar_escola(caminho_banco, sql, parametros):
+    """Executa uma consulta somente leitura no banco de uma escola (roda em outro processo)"""
+    uri = Path(caminho_banco).absolute().as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        return conn.execute(sql, parametros).fetchall()
+    finally:
+        conn.close()
+
+class RoteadorEscolas:
+    """
+    Direciona o sistema para o banco da escola do usuário.
+    - Cada escola tem seu próprio arquivo SQLite em `pasta` (ex: escolas/centro.db)
+    - O banco único 'sistema_notas.db' (instalações antigas) continua listado
+      como a escola 'principal' enquanto existir
+    - As conexões são abertas só quando a escola é usada e fechadas depois
+      de `tempo_ocioso` segundos sem consultas, por fechar_ociosos(): ele roda
+      a cada chamada de sistema() e periodicamente pela InterfacePrincipal.
+      O SistemaNotas devolvido continua válido e reabre a conexão no próximo acesso
+    """
+
+    def __init__(self, pasta='escolas', banco_padrao='sistema_notas.db', tempo_ocioso=300):
+        self.pasta = pasta
+        self.banco_padrao = banco_padrao
+        self.tempo_ocioso = tempo_ocioso
+        self.sistemas = {}   # {escola: SistemaNotas} já usados (conexão aberta ou não)
+
+    def escolas(self):
+        """Retorna {nome da escola: caminho do banco} ('principal' primeiro, demais em ordem alfabética)"""
+        bancos = {}
+        if os.path.isdir(self.pasta):
+            bancos = {os.path.splitext(arquivo)[0]: os.path.join(self.pasta, arquivo)
+                      for arquivo in sorted(os.listdir(self.pasta)) if arquivo.endswith('.db')}
+        bancos.pop(ESCOLA_PADRAO, None)  # Nome reservado para o banco único
+
+        # Instalação antiga (ou nenhuma escola ainda): o banco único é a escola 'principal'
+        if os.path.exists(self.banco_padrao) or not bancos:
+            return {ESCOLA_PADRAO: self.banco_padrao, **bancos}
+        return bancos
+
+    def adicionar_escola(self, nome):
+        """Cria o banco de uma nova escola (com tabelas e usuário secretaria padrão)"""
+        if not re.fullmatch(r'[A-Za-z0-9_-]+', nome):
+            raise ValueError("Nome da escola deve ter apenas letras, números, '-' ou '_'!")
+        if nome == ESCOLA_PADRAO:
+            raise ValueError(f"O nome '{ESCOLA_PADRAO}' é reservado para o banco único!")
+
+        caminho = os.path.join(self.pasta, f'{nome}.db')
+        if os.path.exists(caminho):
+            raise ValueError(f"Escola '{nome}' já cadastrada!")
+
+        os.makedirs(self.pasta, exist_ok=True)
+        SistemaNotas(caminho).fechar()
+        return caminho
+
+    def pasta_snapshot(self, escola):
+        """Pasta do snapshot colunar de cada escola"""
+        if escola == ESCOLA_PADRAO:
+            return 'snapshot_notas'
+        return os.path.join(self.pasta, f'{escola}_snapshot')
+
+    def sistema(self, escola):
+        """Retorna o SistemaNotas da escola, abrindo a conexão se necessário"""
+        self.fechar_ociosos()
+
+        if escola not in self.sistemas:
+            caminho = self.escolas().get(escola)
+            if caminho is None:
+                raise ValueError(f"Escola '{escola}' não encontrada!")
+            self.sistemas[escola] = SistemaNotas(caminho)
+        return self.sistemas[escola]
+
+    def entrar(self, escola, usuario, senha):
+        """
+        Autentica o usuário no banco da escola informada.
+        Retorna o SistemaNotas da escola (ou None se usuário/senha incorretos).
+        """
+        sistema = self.sistema(escola)
+        if sistema.autenticar(usuario, senha):
+            return sistema
+        return None
+
+    def fechar_ociosos(self):
+        """
+        Fecha as conexões sem consultas há mais de `tempo_ocioso` segundos.
+        Quem ainda guarda o SistemaNotas pode continuar usando: ele reabre a conexão.
+        """
+        for sistema in self.sistemas.values():
+            if sistema.ocioso(self.tempo_ocioso):
+                sistema.fechar()
+
+    def conexoes_abertas(self):
+        """Lista as escolas com conexão aberta no momento"""
+        return [escola for escola, sistema in self.sistemas.items() if sistema.conectado()]
+
+    def fechar_todos(self):
+        """Fecha todas as conexões abertas"""
+        for sistema in self.sistemas.values():
+            sistema.fechar()
+        self.sistemas = {}
+
+    def tamanhos(self):
+        """Tamanho em bytes do banco de cada escola (incluindo o arquivo -wal, se houver)"""
+        tamanhos = {}
+        for escola, caminho in self.escolas().items():
+            tamanhos[escola] = sum(os.path.getsize(arquivo)
+                                   for arquivo in (caminho, caminho + '-wal')
+                                   if os.path.exists(arquivo))
+        return tamanhos
+
+    def consultar_rede(self, sql, parametros=()):
+        """
+        Executa a mesma consulta (somente leitura) em todas as escolas,
+        em paralelo, um processo por banco. Retorna {escola: linhas}.
+        Escolas cujo banco ainda não foi criado (ex: instalação nova) ficam de fora.
+        """
+        escolas = {escola: caminho for escola, caminho in self.escolas().items()
+                   if os.path.exists(caminho)}
+        if len(escolas) <= 1:
+            # Uma escola só: não compensa criar processos
+            return {escola: _consultar_escola(caminho, sql, parametros)
+                    for escola, caminho in escolas.items()}
+
+        with ProcessPoolExecutor() as pool:
+            futuros = {escola: pool.submit(_consultar_escola, caminho, sql, parametros)
+                       for escola, caminho in escolas.items()}
+            return {escola: futuro.result() for escola, futuro in futuros.items()}
+
+    def medias_rede(self):
+        """Média de cada disciplina considerando as notas de todas as escolas"""
+        resultados = self.consultar_rede('''
+            SELECT disciplina, SUM(nota), COUNT(*) FROM notas GROUP BY disciplina
+        ''')
+
+        # Junta somas e quantidades de cada escola antes de dividir
+        soma = {}
+        quantidade = {}
+        for linhas in resultados.values():
+            for disciplina, total, count in linhas:
+                soma[disciplina] = soma.get(disciplina, 0) + total
+                quantidade[disciplina] = quantidade.get(disciplina, 0) + count
+
+        return {d: soma[d] / quantidade[d] for d in sorted(soma)}
+
+# ============ 📌 Snapshot colunar das notas (análises) ============
+
+class SnapshotNotas:
+    """
+    Exporta as notas (notas JOIN alunos JOIN professores) em formato colunar:
+    um arquivo NumPy .npy por coluna, que pode ser aberto por memory-map.
+    - turma, disciplina e professor são codificados como índices de um
+      dicionário (lista de nomes) guardado em meta.json
+    - as notas são gravadas como float32
+    - depois da primeira exportação, só as linhas alteradas são relidas do banco
+    """
+
+    COLUNAS = ('nota_id', 'aluno_id', 'turma', 'disciplina', 'professor', 'nota')
+    TIPOS = ('int64', 'int64', 'int32', 'int32', 'int32', 'float32')
+
+    def __init__(self, pasta='snapshot_notas'):
+        self.pasta = pasta
+
+    def _ler_meta(self):
+        """Retorna os metadados do snapshot, ou None se ainda não foi gerado"""
+        try:
+            with open(os.path.join(self.pasta, 'meta.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _arquivo(self, coluna, geracao):
+        return os.path.join(self.pasta, f'{coluna}.{geracao}.npy')
+
+    @staticmethod
+    def _codificar(valores, dicionario):
+        """Troca cada valor pelo seu índice no dicionário (acrescentando os novos)"""
+        indice = {v: i for i, v in enumerate(dicionario)}
+        codigos = []
+        for v in valores:
+            if v not in indice:
+                indice[v] = len(dicionario)
+                dicionario.append(v)
+            codigos.append(indice[v])
+        return np.array(codigos, dtype=np.int32)
+
+    def exportar(self, sistema):
+        """
+        Gera ou atualiza o snapshot a partir do banco do sistema.
+        - Sem snapshot anterior (ou com o registro de alterações descartado):
+          liga o registro de alterações e exporta todas as notas
+        - Com snapshot: relê apenas as notas registradas em notas_alteracoes
+        Retorna a quantidade de notas relidas do banco.
+        """
+        if np is None:
+            raise RuntimeError("NumPy não está instalado (pip install numpy)")
+
+        consulta = '''
+            SELECT n.id, n.aluno_id, a.turma, n.disciplina, p.nome, n.nota
+            FROM notas n
+            JOIN alunos a ON n.aluno_id = a.id
+            JOIN professores p ON n.professor_id = p.id
+        '''
+
+        meta = self._ler_meta()
+        completa = meta is None or not sistema.registro_alteracoes_ativo()
+
+        # O registro é ligado antes da leitura: nada alterado daqui em diante se perde
+        sistema.ativar_registro_alteracoes()
+
+        # Tudo que foi registrado até aqui entra nesta exportação
+        sistema.cursor.execute('SELECT COALESCE(MAX(id), 0) FROM notas_alteracoes')
+        ultima = sistema.cursor.fetchone()[0]
+
+        if completa:
+            # ========== EXPORTAÇÃO COMPLETA ==========
+            geracao = meta['geracao'] if meta else 0
+            meta = {'geracao': geracao, 'turmas': [], 'disciplinas': [], 'professores': []}
+            sistema.cursor.execute(consulta)
+            linhas = sistema.cursor.fetchall()
+            colunas = {c: np.empty(0, dtype=t) for c, t in zip(self.COLUNAS, self.TIPOS)}
+        else:
+            # ========== EXPORTAÇÃO INCREMENTAL ==========
+            sistema.cursor.execute('''
+                SELECT DISTINCT nota_id FROM notas_alteracoes
+                WHERE id > ? AND id <= ?
+            ''', (meta['ultima_alteracao'], ultima))
+            alteradas = [row[0] for row in sistema.cursor.fetchall()]
+            if not alteradas:
+                return 0
+
+            sistema.cursor.execute(consulta + '''
+                WHERE n.id IN (SELECT nota_id FROM notas_alteracoes WHERE id > ? AND id <= ?)
+            ''', (meta['ultima_alteracao'], ultima))
+            linhas = sistema.cursor.fetchall()
+
+            # Remove as versões antigas das linhas alteradas (ou excluídas)
+            antigas = {c: np.load(self._arquivo(c, meta['geracao'])) for c in self.COLUNAS}
+            manter = ~np.isin(antigas['nota_id'], np.array(alteradas, dtype=np.int64))
+            colunas = {c: valores[manter] for c, valores in antigas.items()}
+
+        # Acrescenta as linhas lidas do banco, codificando os textos
+        novas = {
+            'nota_id': np.array([r[0] for r in linhas], dtype=np.int64),
+            'aluno_id': np.array([r[1] for r in linhas], dtype=np.int64),
+            'turma': self._codificar([r[2] for r in linhas], meta['turmas']),
+            'disciplina': self._codificar([r[3] for r in linhas], meta['disciplinas']),
+            'professor': self._codificar([r[4] for r in linhas], meta['professores']),
+            'nota': np.array([r[5] for r in linhas], dtype=np.float32),
+        }
+        colunas = {c: np.concatenate([colunas[c], novas[c]]) for c in self.COLUNAS}
+
+        # Grava uma nova geração de arquivos; meta.json só aponta para ela no fim,
+        # assim quem estiver lendo nunca vê colunas de gerações diferentes
+        os.makedirs(self.pasta, exist_ok=True)
+        geracao_antiga = meta['geracao']
+        meta['geracao'] += 1
+        meta['ultima_alteracao'] = ultima
+        meta['linhas'] = len(colunas['nota_id'])
+        for c in self.COLUNAS:
+            np.save(self._arquivo(c, meta['geracao']), colunas[c])
+
+        temporario = os.path.join(self.pasta, 'meta.json.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temporario, os.path.join(self.pasta, 'meta.json'))
+
+        # Remove a geração anterior (no Windows pode estar aberta por outro leitor)
+        for c in self.COLUNAS:
+            try:
+                os.remove(self._arquivo(c, geracao_antiga))
+            except OSError:
+                pass
+
+        # O registro já processado não é mais necessário
+        sistema.cursor.execute('DELETE FROM notas_alteracoes WHERE id <= ?', (ultima,))
+        sistema.conn.commit()
+
+        return len(linhas)
+
+    def carregar(self):
+        """
+        Abre o snapshot por memory-map (leitura sem cópia).
+        Retorna um dicionário com as colunas (arrays NumPy) e os dicionários
+        de decodificação: 'turmas', 'disciplinas' e 'professores'.
+        """
+        if np is None:
+            raise RuntimeError("NumPy não está instalado (pip install numpy)")
+
+        meta = self._ler_meta()
+        if meta is None:
+            raise FileNotFoundError(f"Snapshot não encontrado em '{self.pasta}'")
+
+        dados = {c: np.load(self._arquivo(c, meta['geracao']), mmap_mode='r') for c in self.COLUNAS}
+        dados['turmas'] = meta['turmas']
+        dados['disciplinas'] = meta['disciplinas']
+        dados['professores'] = meta['professores']
+        return dados
+
+    @staticmethod
+    def medias(dados, coluna):
+        """
+        Média das notas agrupada por 'turma', 'disciplina' ou 'professor'.
+        Ex: SnapshotNotas.medias(snapshot.carregar(), 'turma') -> {'3A': 7.2, ...}
+        """
+        nomes = dados[{'turma': 'turmas', 'disciplina': 'disciplinas', 'professor': 'professores'}[coluna]]
+        codigos = dados[coluna]
+        soma = np.bincount(codigos, weights=dados['nota'], minlength=len(nomes))
+        quantidade = np.bincount(codigos, minlength=len(nomes))
+        return {nome: float(soma[i] / quantidade[i]) for i, nome in enumerate(nomes) if quantidade[i]}
+
+# ============ 📌 Matriz de notas (boletim da turma) ============
+
+NOTA_MINIMA_APROVACAO = 6.0  # Notas abaixo disso aparecem em vermelho
+
+class MatrizNotasCanvas(tk.Frame):
+    """
+    Grade alunos × disciplinas desenhada em um tk.Canvas.
+    - Desenha apenas as células visíveis (aguenta milhares de alunos)
+    - Cabeçalho (disciplina/professor) e primeira coluna (alunos) ficam congelados
+    - Notas abaixo da média aparecem em uma escala de vermelho
+    - Duplo clique edita a célula; as alterações ficam pendentes até salvar
+    """
+
+    LARGURA_NOME = 240       # Coluna congelada com matrícula e nome
+    LARGURA_CELULA = 90
+    ALTURA_CABECALHO = 40    # Linha congelada com disciplina e professor
+    ALTURA_LINHA = 24
+
+    def __init__(self, master):
+        super().__init__(master, bg='#ecf0f1')
+
+        self.alunos = []         # Lista de (id, matricula, nome)
+        self.colunas = []        # Lista de (disciplina, professor_id, nome do professor, editavel)
+        self.valores = []        # valores[i][j] = nota gravada no banco
+        self.pendentes = {}      # {(i, j): nota} editadas e ainda não salvas
+        self.topo = 0            # Deslocamento vertical (pixels)
+        self.esquerda = 0        # Deslocamento horizontal (pixels)
+        self.editor = None       # (Entry, (i, j)) da célula em edição
+
+        self.canvas = tk.Canvas(self, bg='white', highlightthickness=0)
+        self.scroll_y = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.scroll_x = ttk.Scrollbar(self, orient='horizontal', command=self.xview)
+
+        self.canvas.grid(row=0, column=0, sticky='nsew')
+        self.scroll_y.grid(row=0, column=1, sticky='ns')
+        self.scroll_x.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        # Eventos: redimensionar, editar e rolar com o mouse (Windows/Mac e Linux)
+        self.canvas.bind('<Configure>', lambda e: self.redesenhar())
+        self.canvas.bind('<Double-Button-1>', self.iniciar_edicao)
+        self.canvas.bind('<MouseWheel>',
+                         lambda e: self.yview('scroll', -3 if e.delta > 0 else 3, 'units'))
+        self.canvas.bind('<Shift-MouseWheel>',
+                         lambda e: self.xview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.yview('scroll', -3, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.yview('scroll', 3, 'units'))
+
+    def carregar(self, alunos, colunas, valores):
+        """Exibe uma nova matriz (descarta alterações pendentes)"""
+        self.cancelar_edicao()
+        self.alunos, self.colunas, self.valores = alunos, colunas, valores
+        self.pendentes = {}
+        self.topo = 0
+        self.esquerda = 0
+        self.redesenhar()
+
+    def alteracoes_pendentes(self):
+        """Retorna as edições no formato esperado por SistemaNotas.salvar_notas_lote"""
+        return {(self.alunos[i][0], self.colunas[j][0], self.colunas[j][1]): nota
+                for (i, j), nota in self.pendentes.items()}
+
+    def marcar_salvas(self):
+        """Incorpora as edições pendentes depois de gravadas no banco"""
+        for (i, j), nota in self.pendentes.items():
+            self.valores[i][j] = nota
+        self.pendentes = {}
+        self.redesenhar()
+
+    # ========== ROLAGEM ==========
+
+    def _area_visivel(self):
+        """Largura e altura da área de células (sem os cabeçalhos congelados)"""
+        largura = max(self.canvas.winfo_width() - self.LARGURA_NOME, 1)
+        altura = max(self.canvas.winfo_height() - self.ALTURA_CABECALHO, 1)
+        return largura, altura
+
+    def _mover(self, eixo, acao, valor, unidade=None):
+        """Trata os comandos 'moveto' e 'scroll' enviados pelas scrollbars"""
+        largura, altura = self._area_visivel()
+        if eixo == 'y':
+            total, passo, pagina = len(self.alunos) * self.ALTURA_LINHA, self.ALTURA_LINHA, altura
+            atual = self.topo
+        else:
+            total, passo, pagina = len(self.colunas) * self.LARGURA_CELULA, self.LARGURA_CELULA, largura
+            atual = self.esquerda
+
+        if acao == 'moveto':
+            nova = int(float(valor) * total)
+        else:
+            nova = atual + int(valor) * (pagina if unidade == 'pages' else passo)
+
+        if eixo == 'y':
+            self.topo = nova
+        else:
+            self.esquerda = nova
+        self.redesenhar()
+
+    def yview(self, *args):
+        self._mover('y', *args)
+
+    def xview(self, *args):
+        self._mover('x', *args)
+
+    # ========== DESENHO ==========
+
+    @staticmethod
+    def cor_nota(nota):
+        """Branco sem nota, verde claro se aprovado, vermelho mais forte quanto menor a nota"""
+        if nota is None:
+            return 'white'
+        if nota >= NOTA_MINIMA_APROVACAO:
+            return '#d5f5e3'
+        intensidade = int(0x70 + (0xd8 - 0x70) * nota / NOTA_MINIMA_APROVACAO)
+        return f'#ff{intensidade:02x}{intensidade:02x}'
+
+    def redesenhar(self):
+        """Redesenha apenas as linhas e colunas que cabem na tela"""
+        self.cancelar_edicao()
+        c = self.canvas
+        c.delete('all')
+
+        largura, altura = self._area_visivel()
+        total_x = len(self.colunas) * self.LARGURA_CELULA
+        total_y = len(self.alunos) * self.ALTURA_LINHA
+
+        # Mantém o deslocamento dentro dos limites da matriz
+        self.esquerda = max(0, min(self.esquerda, total_x - largura))
+        self.topo = max(0, min(self.topo, total_y - altura))
+
+        # Faixa de linhas/colunas visíveis
+        lin_ini = self.topo // self.ALTURA_LINHA
+        lin_fim = min(len(self.alunos), (self.topo + altura) // self.ALTURA_LINHA + 1)
+        col_ini = self.esquerda // self.LARGURA_CELULA
+        col_fim = min(len(self.colunas), (self.esquerda + largura) // self.LARGURA_CELULA + 1)
+
+        # --- CÉLULAS DE NOTAS ---
+        for i in range(lin_ini, lin_fim):
+            y = self.ALTURA_CABECALHO + i * self.ALTURA_LINHA - self.topo
+            for j in range(col_ini, col_fim):
+                x = self.LARGURA_NOME + j * self.LARGURA_CELULA - self.esquerda
+                pendente = (i, j) in self.pendentes
+                nota = self.pendentes[(i, j)] if pendente else self.valores[i][j]
+
+                # Borda laranja indica alteração ainda não salva
+                c.create_rectangle(x, y, x + self.LARGURA_CELULA, y + self.ALTURA_LINHA,
+                                   fill=self.cor_nota(nota),
+                                   outline='#f39c12' if pendente else '#bdc3c7',
+                                   width=2 if pendente else 1)
+                if nota is not None:
+                    c.create_text(x + self.LARGURA_CELULA / 2, y + self.ALTURA_LINHA / 2,
+                                  text=f"{nota:.1f}", font=('Arial', 10))
+
+        # --- COLUNA CONGELADA (desenhada por cima das células) ---
+        for i in range(lin_ini, lin_fim):
+            y = self.ALTURA_CABECALHO + i * self.ALTURA_LINHA - self.topo
+            _, matricula, nome = self.alunos[i]
+            c.create_rectangle(0, y, self.LARGURA_NOME, y + self.ALTURA_LINHA,
+                               fill='#ecf0f1', outline='#bdc3c7')
+            c.create_text(6, y + self.ALTURA_LINHA / 2, anchor='w',
+                          text=f"{matricula} - {nome}"[:32], font=('Arial', 10))
+
+        # --- CABEÇALHO CONGELADO ---
+        for j in range(col_ini, col_fim):
+            x = self.LARGURA_NOME + j * self.LARGURA_CELULA - self.esquerda
+            # Cabeçalho cinza: professor excluído, coluna só de leitura
+            c.create_rectangle(x, 0, x + self.LARGURA_CELULA, self.ALTURA_CABECALHO,
+                               fill='#34495e' if self.colunas[j][3] else '#7f8c8d', outline='#2c3e50')
+            c.create_text(x + self.LARGURA_CELULA / 2, self.ALTURA_CABECALHO / 2,
+                          text=f"{self.colunas[j][0][:12]}\n{self.colunas[j][2][:12]}",
+                          fill='white', font=('Arial', 9, 'bold'), justify='center')
+
+        # Canto superior esquerdo
+        c.create_rectangle(0, 0, self.LARGURA_NOME, self.ALTURA_CABECALHO,
+                           fill='#2c3e50', outline='#2c3e50')
+        c.create_text(6, self.ALTURA_CABECALHO / 2, anchor='w', text="Aluno / Disciplina",
+                      fill='white', font=('Arial', 10, 'bold'))
+
+        # Atualiza a posição das scrollbars
+        self.scroll_y.set(*self._fracao(self.topo, altura, total_y))
+        self.scroll_x.set(*self._fracao(self.esquerda, largura, total_x))
+
+    @staticmethod
+    def _fracao(posicao, visivel, total):
+        if total <= 0:
+            return 0.0, 1.0
+        return posicao / total, min(1.0, (posicao + visivel) / total)
+
+    # ========== EDIÇÃO NA PRÓPRIA CÉLULA ==========
+
+    def _celula_em(self, x, y):
+        """Converte coordenadas do canvas em (linha, coluna), ou None fora das células"""
+        if x < self.LARGURA_NOME or y < self.ALTURA_CABECALHO:
+            return None
+        i = (y - self.ALTURA_CABECALHO + self.topo) // self.ALTURA_LINHA
+        j = (x - self.LARGURA_NOME + self.esquerda) // self.LARGURA_CELULA
+        if i < len(self.alunos) and j < len(self.colunas):
+            return i, j
+        return None
+
+    def iniciar_edicao(self, event):
+        """Abre um campo de texto sobre a célula clicada"""
+        celula = self._celula_em(event.x, event.y)
+        if celula is None or not self.colunas[celula[1]][3]:
+            return  # Fora das células ou coluna de professor excluído
+        self.cancelar_edicao()
+
+        i, j = celula
+        x = self.LARGURA_NOME + j * self.LARGURA_CELULA - self.esquerda
+        y = self.ALTURA_CABECALHO + i * self.ALTURA_LINHA - self.topo
+        nota = self.pendentes.get(celula, self.valores[i][j])
+
+        entry = tk.Entry(self.canvas, justify='center', bd=0, font=('Arial', 10))
+        if nota is not None:
+            entry.insert(0, f"{nota:g}")
+        entry.select_range(0, tk.END)
+        entry.bind('<Return>', lambda e: self.confirmar_edicao())
+        entry.bind('<Escape>', lambda e: self.cancelar_edicao())
+
+        self.canvas.create_window(x, y, window=entry, anchor='nw',
+                                  width=self.LARGURA_CELULA, height=self.ALTURA_LINHA)
+        entry.focus_set()
+        self.editor = (entry, celula)
+
+    def confirmar_edicao(self):
+        """Valida o valor digitado e guarda como alteração pendente"""
+        entry, (i, j) = self.editor
+        texto = entry.get().strip().replace(',', '.')
+        if not texto:
+            self.cancelar_edicao()
+            return
+
+        try:
+            nota = float(texto)
+        except ValueError:
+            messagebox.showerror("Erro", "Nota inválida!")
+            return
+        if nota < 0 or nota > 10:
+            messagebox.showwarning("Aviso", "Nota deve estar entre 0 e 10!")
+            return
+
+        if nota == self.valores[i][j]:
+            self.pendentes.pop((i, j), None)  # Voltou ao valor original
+        else:
+            self.pendentes[(i, j)] = nota
+        self.redesenhar()
+
+    def cancelar_edicao(self):
+        """Fecha o campo de edição (se houver) sem alterar a célula"""
+        if self.editor:
+            self.editor[0].destroy()
+            self.editor = None
+
 # ============ 📌 Interface gráfica de login ============
 
 class InterfaceLogin:
-    def __init__(self, sistema):
-        self.sistema = sistema                                           # Recebe o objeto 'sistema' que contém a lógica de autenticação
+    def __init__(self, roteador):
+        self.roteador = roteador                                         # Recebe o roteador que abre o banco da escola do usuário
+        self.escolas = list(roteador.escolas())                          # Escolas disponíveis para login
         self.janela = tk.Tk()                                            # Cria a janela principal do Tkinter
         self.janela.title("Login - Sistema de Gerenciamento de Notas")   # Define o título que aparece na barra superior da janela
         self.janela.geometry("400x300")                                  # Define as dimensões da janela (largura x altura em pixels)
@@ -167,6 +1293,15 @@ class InterfaceLogin:
                 bg='#2c3e50', fg='white').pack(pady=5)
         self.entry_senha = tk.Entry(frame, font=('Arial', 12), width=25, show='*')
         self.entry_senha.pack(pady=5)
+
+        # --- CAMPO ESCOLA (só aparece quando há mais de uma escola) ---
+        self.combo_escola = None
+        if len(self.escolas) > 1:
+            self.janela.geometry("400x360")
+            tk.Label(frame, text="Escola:", font=('Arial', 12),
+                    bg='#2c3e50', fg='white').pack(pady=5)
+            self.combo_escola = ttk.Combobox(frame, values=self.escolas, state='readonly', width=23)
+            self.combo_escola.pack(pady=5)
         
         # --- BOTÃO DE LOGIN ---
         tk.Button(frame, text="Entrar", font=('Arial', 12, 'bold'),
@@ -183,9 +1318,18 @@ class InterfaceLogin:
         usuario = self.entry_usuario.get()
         senha = self.entry_senha.get()
         
-        if self.sistema.autenticar(usuario, senha):
+        if self.combo_escola is not None:
+            escola = self.combo_escola.get()
+            if not escola:
+                messagebox.showwarning("Aviso", "Selecione a escola!")
+                return
+        else:
+            escola = self.escolas[0]
+
+        sistema = self.roteador.entrar(escola, usuario, senha)
+        if sistema:
             self.janela.destroy()
-            InterfacePrincipal(self.sistema)
+            InterfacePrincipal(sistema, self.roteador)
         else:
             messagebox.showerror("Erro", "Usuário ou senha incorretos!")
 
@@ -196,14 +1340,16 @@ class InterfacePrincipal:
     Gerencia as diferentes visões: Secretaria, Professor e Aluno.
     """
     
-    def __init__(self, sistema):
+    def __init__(self, sistema, roteador):
         """
         Inicializa a interface principal do sistema.
         
         Args:
             sistema: Instância do sistema contendo conexão BD e dados do usuário logado
+            roteador: Roteador de escolas, usado para voltar à tela de login
         """
         self.sistema = sistema
+        self.roteador = roteador
         
         # Configuração da janela principal
         self.janela = tk.Tk()
@@ -233,9 +1379,22 @@ class InterfacePrincipal:
         # Carrega interface específica baseada no tipo de usuário
         self.carregar_interface()
         
+        # Fecha de tempos em tempos as conexões das escolas sem uso
+        self.agendar_fechar_ociosos()
+        
         # Inicia o loop principal da interface
         self.janela.mainloop()
     
+    def agendar_fechar_ociosos(self):
+        """
+        Fecha as conexões ociosas do roteador e agenda a próxima verificação.
+        Verifica na metade do tempo ocioso, então nenhuma conexão fica aberta
+        mais que 1,5x esse tempo sem uso enquanto a janela estiver aberta.
+        """
+        self.roteador.fechar_ociosos()
+        intervalo = max(1000, int(self.roteador.tempo_ocioso * 500))  # Em milissegundos
+        self.janela.after(intervalo, self.agendar_fechar_ociosos)
+    
     def limpar_conteudo(self):
         """
         Remove todos os widgets do frame de conteúdo.
@@ -313,25 +1472,8 @@ class InterfacePrincipal:
             4. Atualiza a lista e limpa o formulário
             """
             try:
-                # Gera matrícula sequencial automaticamente
-                matricula = self.sistema.gerar_matricula()
-                
-                # Criptografa senha em MD5 e insere usuário
-                senha_hash = hashlib.md5(entry_pass.get().encode()).hexdigest()
-                self.sistema.cursor.execute('''
-                    INSERT INTO usuarios (usuario, senha, tipo, nome)
-                    VALUES (?, ?, ?, ?)
-                ''', (entry_user.get(), senha_hash, 'aluno', entry_nome.get()))
-                usuario_id = self.sistema.cursor.lastrowid  # ID do usuário recém-criado
-                
-                # Insere aluno vinculado ao usuário criado
-                self.sistema.cursor.execute('''
-                    INSERT INTO alunos (matricula, nome, turma, usuario_id)
-                    VALUES (?, ?, ?, ?)
-                ''', (matricula, entry_nome.get(), entry_turma.get(), usuario_id))
-                
-                # Confirma transações no banco
-                self.sistema.conn.commit()
+                matricula = self.sistema.cadastrar_aluno(entry_nome.get(), entry_turma.get(),
+                                                         entry_user.get(), entry_pass.get())
                 
                 # Feedback visual e limpeza do formulário
                 messagebox.showinfo("Sucesso", f"Aluno cadastrado!\nMatrícula: {matricula}")
@@ -378,8 +1520,7 @@ class InterfacePrincipal:
             Ordena por ID decrescente (mais recentes primeiro).
             """
             tree_alunos.delete(*tree_alunos.get_children())  # Limpa lista atual
-            self.sistema.cursor.execute('SELECT id, matricula, nome, turma FROM alunos ORDER BY id DESC')
-            for row in self.sistema.cursor.fetchall():
+            for row in self.sistema.listar_alunos():
                 tree_alunos.insert('', 'end', values=row)
         
         def excluir_aluno():
@@ -397,8 +1538,7 @@ class InterfacePrincipal:
             
             # Confirmação de exclusão
             if messagebox.askyesno("Confirmar", "Deseja realmente excluir este aluno?"):
-                self.sistema.cursor.execute('DELETE FROM alunos WHERE id = ?', (aluno_id,))
-                self.sistema.conn.commit()
+                self.sistema.excluir_aluno(aluno_id)
                 messagebox.showinfo("Sucesso", "Aluno excluído!")
                 atualizar_lista()
         
@@ -451,24 +1591,8 @@ class InterfacePrincipal:
             Processo similar ao cadastro de aluno.
             """
             try:
-                # Gera código automático para o professor
-                codigo = self.sistema.gerar_codigo_professor()
-                
-                # Cria usuário com senha MD5
-                senha_hash = hashlib.md5(entry_pass_prof.get().encode()).hexdigest()
-                self.sistema.cursor.execute('''
-                    INSERT INTO usuarios (usuario, senha, tipo, nome)
-                    VALUES (?, ?, ?, ?)
-                ''', (entry_user_prof.get(), senha_hash, 'professor', entry_nome_prof.get()))
-                usuario_id = self.sistema.cursor.lastrowid
-                
-                # Insere professor vinculado ao usuário
-                self.sistema.cursor.execute('''
-                    INSERT INTO professores (codigo, nome, disciplina, usuario_id)
-                    VALUES (?, ?, ?, ?)
-                ''', (codigo, entry_nome_prof.get(), entry_disc.get(), usuario_id))
-                
-                self.sistema.conn.commit()
+                codigo = self.sistema.cadastrar_professor(entry_nome_prof.get(), entry_disc.get(),
+                                                          entry_user_prof.get(), entry_pass_prof.get())
                 messagebox.showinfo("Sucesso", f"Professor cadastrado!\nCódigo: {codigo}")
                 atualizar_lista_prof()
                 
@@ -509,8 +1633,7 @@ class InterfacePrincipal:
         def atualizar_lista_prof():
             """Recarrega lista de professores do banco."""
             tree_profs.delete(*tree_profs.get_children())
-            self.sistema.cursor.execute('SELECT id, codigo, nome, disciplina FROM professores ORDER BY id DESC')
-            for row in self.sistema.cursor.fetchall():
+            for row in self.sistema.listar_professores():
                 tree_profs.insert('', 'end', values=row)
         
         def excluir_professor():
@@ -524,8 +1647,7 @@ class InterfacePrincipal:
             prof_id = item['values'][0]
             
             if messagebox.askyesno("Confirmar", "Deseja realmente excluir este professor?"):
-                self.sistema.cursor.execute('DELETE FROM professores WHERE id = ?', (prof_id,))
-                self.sistema.conn.commit()
+                self.sistema.excluir_professor(prof_id)
                 messagebox.showinfo("Sucesso", "Professor excluído!")
                 atualizar_lista_prof()
         
@@ -533,6 +1655,59 @@ class InterfacePrincipal:
                  command=excluir_professor).pack(pady=5)
         
         atualizar_lista_prof()
+
+        # ========== ABA DE BOLETIM DA TURMA ==========
+        # Matriz alunos × disciplinas com edição direto na célula
+        frame_boletim = tk.Frame(notebook, bg='#ecf0f1')
+        notebook.add(frame_boletim, text='Boletim da Turma')
+
+        TODAS = "(Escola inteira)"
+
+        # --- FILTRO DE TURMA ---
+        frame_filtro = tk.Frame(frame_boletim, bg='#ecf0f1')
+        frame_filtro.pack(fill='x', padx=10, pady=10)
+
+        tk.Label(frame_filtro, text="Turma:", bg='#ecf0f1').pack(side='left', padx=5)
+        # postcommand recarrega as turmas sempre que a lista é aberta
+        combo_turmas = ttk.Combobox(frame_filtro, state='readonly', width=20,
+                                    postcommand=lambda: combo_turmas.configure(
+                                        values=[TODAS] + self.sistema.listar_turmas()))
+        combo_turmas.pack(side='left', padx=5)
+
+        matriz = MatrizNotasCanvas(frame_boletim)
+        matriz.pack(fill='both', expand=True, padx=10, pady=5)
+
+        def carregar_boletim():
+            """Carrega a matriz da turma selecionada (uma consulta por turma)."""
+            turma = combo_turmas.get()
+            if not turma:
+                messagebox.showwarning("Aviso", "Selecione uma turma!")
+                return
+            if matriz.pendentes and not messagebox.askyesno(
+                    "Confirmar", "Existem alterações não salvas. Deseja descartá-las?"):
+                return
+            matriz.carregar(*self.sistema.buscar_matriz_notas(None if turma == TODAS else turma))
+
+        def salvar_boletim():
+            """Grava de uma vez todas as notas editadas na matriz."""
+            alteracoes = matriz.alteracoes_pendentes()
+            if not alteracoes:
+                messagebox.showinfo("Aviso", "Nenhuma alteração para salvar.")
+                return
+            try:
+                self.sistema.salvar_notas_lote(alteracoes)
+            except Exception as e:
+                messagebox.showerror("Erro", f"Erro ao salvar notas: {str(e)}")
+                return
+            matriz.marcar_salvas()
+            messagebox.showinfo("Sucesso", f"{len(alteracoes)} nota(s) salva(s)!")
+
+        tk.Button(frame_filtro, text="Carregar", bg='#3498db', fg='white',
+                 command=carregar_boletim).pack(side='left', padx=10)
+        tk.Button(frame_filtro, text="Salvar Alterações", bg='#27ae60', fg='white',
+                 command=salvar_boletim).pack(side='left', padx=5)
+        tk.Label(frame_filtro, text="Duplo clique na célula para editar",
+                bg='#ecf0f1', fg='#7f8c8d', font=('Arial', 9, 'italic')).pack(side='left', padx=10)
     
     def interface_professor(self):
         """
@@ -542,11 +1717,7 @@ class InterfacePrincipal:
         self.limpar_conteudo()
         
         # ========== BUSCA DADOS DO PROFESSOR LOGADO ==========
-        self.sistema.cursor.execute('''
-            SELECT id, nome, disciplina FROM professores
-            WHERE usuario_id = ?
-        ''', (self.sistema.usuario_logado,))
-        prof_data = self.sistema.cursor.fetchone()
+        prof_data = self.sistema.buscar_professor(self.sistema.usuario_logado)
         
         if not prof_data:
             messagebox.showerror("Erro", "Dados do professor não encontrados!")
@@ -566,9 +1737,8 @@ class InterfacePrincipal:
         tk.Label(frame_notas, text="Aluno:", bg='#ecf0f1').grid(row=0, column=0, padx=5, pady=5)
         
         # ComboBox com lista de todos os alunos (formato: MATRÍCULA - NOME)
-        self.sistema.cursor.execute('SELECT id, nome, matricula FROM alunos')
-        alunos = self.sistema.cursor.fetchall()
-        alunos_dict = {f"{a[2]} - {a[1]}": a[0] for a in alunos}  # Dicionário para recuperar ID
+        alunos = self.sistema.listar_alunos()
+        alunos_dict = {f"{a[1]} - {a[2]}": a[0] for a in alunos}  # Dicionário para recuperar ID
         
         combo_alunos = ttk.Combobox(frame_notas, values=list(alunos_dict.keys()), width=40)
         combo_alunos.grid(row=0, column=1, padx=5, pady=5)
@@ -599,30 +1769,11 @@ class InterfacePrincipal:
                     messagebox.showwarning("Aviso", "Nota deve estar entre 0 e 10!")
                     return
                 
-                # Verifica se já existe nota para este aluno nesta disciplina
-                self.sistema.cursor.execute('''
-                    SELECT id FROM notas
-                    WHERE aluno_id = ? AND disciplina = ? AND professor_id = ?
-                ''', (aluno_id, disciplina, prof_id))
-                
-                existe = self.sistema.cursor.fetchone()
-                
-                if existe:
-                    # Atualiza nota existente
-                    self.sistema.cursor.execute('''
-                        UPDATE notas SET nota = ?
-                        WHERE aluno_id = ? AND disciplina = ? AND professor_id = ?
-                    ''', (nota, aluno_id, disciplina, prof_id))
-                    messagebox.showinfo("Sucesso", "Nota atualizada com sucesso!")
-                else:
-                    # Insere nova nota
-                    self.sistema.cursor.execute('''
-                        INSERT INTO notas (aluno_id, disciplina, nota, professor_id)
-                        VALUES (?, ?, ?, ?)
-                    ''', (aluno_id, disciplina, nota, prof_id))
+                if self.sistema.lancar_nota(aluno_id, disciplina, prof_id, nota):
                     messagebox.showinfo("Sucesso", "Nota lançada com sucesso!")
+                else:
+                    messagebox.showinfo("Sucesso", "Nota atualizada com sucesso!")
                 
-                self.sistema.conn.commit()
                 atualizar_lista_notas()
                 entry_nota.delete(0, tk.END)
                 
@@ -634,6 +1785,139 @@ class InterfacePrincipal:
         # Botão azul para lançar nota
         tk.Button(frame_notas, text="Lançar/Alterar Nota", bg='#3498db', fg='white',
                  command=lancar_nota).grid(row=0, column=4, padx=10, pady=5)
+
+        def abrir_chamada():
+            """
+            Abre a janela de chamada da disciplina do professor.
+            - Escolhe a turma e a aula (por padrão, a próxima aula)
+            - Na aula nova todos começam como presentes; numa aula já
+              registrada aparecem as presenças gravadas (para corrigir),
+              só dos alunos que já estavam na turma nessa aula
+            - Duplo clique alterna entre Presente e Falta
+            - A chamada da turma inteira é gravada de uma vez
+            """
+            janela = tk.Toplevel(self.janela)
+            janela.title(f"Chamada - {disciplina}")
+            janela.geometry("650x500")
+            janela.configure(bg='#ecf0f1')
+
+            frame_topo = tk.Frame(janela, bg='#ecf0f1')
+            frame_topo.pack(fill='x', padx=10, pady=10)
+
+            tk.Label(frame_topo, text="Turma:", bg='#ecf0f1').pack(side='left', padx=5)
+            combo_turma = ttk.Combobox(frame_topo, values=self.sistema.listar_turmas(),
+                                       state='readonly', width=15)
+            combo_turma.pack(side='left', padx=5)
+
+            # Número da aula (1, 2, 3...) - vai até a próxima aula ainda sem chamada
+            tk.Label(frame_topo, text="Aula nº:", bg='#ecf0f1').pack(side='left', padx=(20, 5))
+            var_aula = tk.StringVar(value='1')
+            spin_aula = tk.Spinbox(frame_topo, from_=1, to=1, width=5, state='readonly',
+                                   textvariable=var_aula)
+            spin_aula.pack(side='left', padx=5)
+
+            label_situacao = tk.Label(frame_topo, text="", font=('Arial', 10, 'bold'), bg='#ecf0f1')
+            label_situacao.pack(side='left', padx=15)
+
+            tree_chamada = ttk.Treeview(janela, columns=('Matrícula', 'Aluno', 'Presença', 'Frequência'),
+                                        show='headings', height=15)
+            tree_chamada.heading('Matrícula', text='Matrícula')
+            tree_chamada.heading('Aluno', text='Aluno')
+            tree_chamada.heading('Presença', text='Presença')
+            tree_chamada.heading('Frequência', text='Frequência')
+
+            tree_chamada.column('Matrícula', width=100)
+            tree_chamada.column('Aluno', width=250)
+            tree_chamada.column('Presença', width=100)
+            tree_chamada.column('Frequência', width=100)
+
+            tree_chamada.pack(fill='both', expand=True, padx=10, pady=5)
+
+            botao_registrar = tk.Button(janela, text="Registrar Chamada", bg='#27ae60', fg='white')
+            botao_registrar.pack(pady=10)
+
+            def mostrar_aula():
+                """Lista os alunos da turma com a presença da aula escolhida."""
+                turma = combo_turma.get()
+                if not turma:
+                    return
+                aula = int(var_aula.get()) - 1
+                proxima = self.sistema.proxima_aula(turma, disciplina)
+
+                tree_chamada.delete(*tree_chamada.get_children())
+                alunos_turma = self.sistema.alunos_da_turma(turma)
+                frequencias = self.sistema.frequencias_turma(turma, disciplina)
+                registrada = self.sistema.chamada_registrada(turma, disciplina, aula)
+
+                for aluno_id, matricula, nome_aluno in alunos_turma:
+                    if aula < proxima and aluno_id not in registrada:
+                        continue  # Entrou na turma depois dessa aula
+                    presencas, aulas = frequencias.get(aluno_id, (0, 0))
+                    presente = registrada.get(aluno_id, True)
+                    tree_chamada.insert('', 'end', iid=str(aluno_id),
+                                        values=(matricula, nome_aluno, 'Presente' if presente else 'Falta',
+                                                formatar_frequencia(presencas, aulas)))
+
+                if aula < proxima:
+                    label_situacao.config(text="Aula já registrada (correção)", fg='#e67e22')
+                    botao_registrar.config(text="Corrigir Chamada", state='normal')
+                else:
+                    label_situacao.config(text="Aula nova", fg='#27ae60')
+                    botao_registrar.config(text="Registrar Chamada", state='normal')
+
+            def carregar_turma(event=None):
+                """Seleciona a próxima aula da turma escolhida."""
+                proxima = self.sistema.proxima_aula(combo_turma.get(), disciplina)
+                spin_aula.config(to=proxima + 1)
+                var_aula.set(str(proxima + 1))
+                mostrar_aula()
+
+            def alternar_presenca(event):
+                """Troca Presente ↔ Falta no aluno clicado."""
+                item = tree_chamada.identify_row(event.y)
+                if item:
+                    atual = tree_chamada.set(item, 'Presença')
+                    tree_chamada.set(item, 'Presença', 'Falta' if atual == 'Presente' else 'Presente')
+
+            def registrar():
+                """Grava a chamada da turma inteira para a aula escolhida."""
+                itens = tree_chamada.get_children()
+                if not itens:
+                    messagebox.showwarning("Aviso", "Selecione uma turma!", parent=janela)
+                    return
+
+                turma = combo_turma.get()
+                aula = int(var_aula.get()) - 1
+                if aula < self.sistema.proxima_aula(turma, disciplina) and not messagebox.askyesno(
+                        "Confirmar", f"A aula {aula + 1} já foi registrada. Deseja substituir a chamada?",
+                        parent=janela):
+                    return
+
+                presencas = {int(item): tree_chamada.set(item, 'Presença') == 'Presente'
+                             for item in itens}
+                try:
+                    self.sistema.registrar_chamada(turma, disciplina, presencas, aula=aula)
+                except Exception as e:
+                    messagebox.showerror("Erro", f"Erro ao registrar chamada: {str(e)}", parent=janela)
+                    return
+
+                messagebox.showinfo("Sucesso", f"Chamada da aula {aula + 1} registrada!", parent=janela)
+
+                # Atualiza as frequências mas não deixa gravar de novo sem querer:
+                # para outra aula é preciso escolher a turma ou o número da aula
+                mostrar_aula()
+                spin_aula.config(to=self.sistema.proxima_aula(turma, disciplina) + 1)
+                label_situacao.config(text="Chamada registrada", fg='#27ae60')
+                botao_registrar.config(state='disabled')
+
+            botao_registrar.config(command=registrar)
+            combo_turma.bind('<<ComboboxSelected>>', carregar_turma)
+            spin_aula.config(command=mostrar_aula)
+            tree_chamada.bind('<Double-Button-1>', alternar_presenca)
+
+        # Botão para abrir a chamada
+        tk.Button(frame_notas, text="Fazer Chamada", bg='#8e44ad', fg='white',
+                 command=abrir_chamada).grid(row=0, column=5, padx=5, pady=5)
         
         # ========== LISTA DE ALUNOS E SUAS NOTAS ==========
         frame_lista = tk.Frame(self.frame_conteudo, bg='#ecf0f1')
@@ -664,15 +1948,7 @@ class InterfacePrincipal:
             Filtra apenas pela disciplina do professor logado.
             """
             tree_notas.delete(*tree_notas.get_children())
-            self.sistema.cursor.execute('''
-                SELECT a.matricula, a.nome, a.turma, COALESCE(n.nota, '-') as nota
-                FROM alunos a
-                LEFT JOIN notas n ON a.id = n.aluno_id 
-                    AND n.disciplina = ? AND n.professor_id = ?
-                ORDER BY a.nome
-            ''', (disciplina, prof_id))
-            
-            for row in self.sistema.cursor.fetchall():
+            for row in self.sistema.notas_da_disciplina(disciplina, prof_id):
                 tree_notas.insert('', 'end', values=row)
         
         atualizar_lista_notas()
@@ -685,11 +1961,7 @@ class InterfacePrincipal:
         self.limpar_conteudo()
         
         # ========== BUSCA DADOS DO ALUNO LOGADO ==========
-        self.sistema.cursor.execute('''
-            SELECT id, nome, matricula, turma FROM alunos
-            WHERE usuario_id = ?
-        ''', (self.sistema.usuario_logado,))
-        aluno_data = self.sistema.cursor.fetchone()
+        aluno_data = self.sistema.buscar_aluno(self.sistema.usuario_logado)
         
         if not aluno_data:
             messagebox.showerror("Erro", "Dados do aluno não encontrados!")
@@ -715,36 +1987,47 @@ class InterfacePrincipal:
                                     font=('Arial', 12, 'bold'), bg='#ecf0f1')
         frame_notas.pack(fill='both', expand=True, padx=20, pady=10)
         
-        tree_notas = ttk.Treeview(frame_notas, columns=('Disciplina', 'Nota', 'Professor'),
+        tree_notas = ttk.Treeview(frame_notas, columns=('Disciplina', 'Nota', 'Frequência', 'Professor', 'Situação'),
                                   show='headings', height=15)
         tree_notas.heading('Disciplina', text='Disciplina')
         tree_notas.heading('Nota', text='Nota')
+        tree_notas.heading('Frequência', text='Frequência')
         tree_notas.heading('Professor', text='Professor')
+        tree_notas.heading('Situação', text='Situação')
         
-        tree_notas.column('Disciplina', width=200)
-        tree_notas.column('Nota', width=100)
-        tree_notas.column('Professor', width=250)
+        tree_notas.column('Disciplina', width=180)
+        tree_notas.column('Nota', width=80)
+        tree_notas.column('Frequência', width=90)
+        tree_notas.column('Professor', width=220)
+        tree_notas.column('Situação', width=100)
         
         tree_notas.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Busca todas as notas do aluno com JOIN para pegar nome do professor
-        self.sistema.cursor.execute('''
-            SELECT n.disciplina, n.nota, p.nome
-            FROM notas n
-            JOIN professores p ON n.professor_id = p.id
-            WHERE n.aluno_id = ?
-            ORDER BY n.disciplina
-        ''', (aluno_id,))
+        notas_aluno = self.sistema.notas_do_aluno(aluno_id)
+
+        # Frequência do período atual em cada disciplina
+        frequencias = self.sistema.frequencias_aluno(aluno_id)
         
         # Variáveis para calcular média geral
         total_notas = 0
         count = 0
         
         # Preenche lista de notas
-        for row in self.sistema.cursor.fetchall():
-            tree_notas.insert('', 'end', values=row)
-            total_notas += row[1]  # Soma as notas
+        for disciplina, nota, professor in notas_aluno:
+            presencas, aulas = frequencias.get(disciplina, (0, 0))
+            tree_notas.insert('', 'end', values=(disciplina, nota, formatar_frequencia(presencas, aulas),
+                                                 professor, situacao_final(nota, presencas, aulas)))
+            total_notas += nota  # Soma as notas
             count += 1
+
+        # Disciplinas que já têm chamada mas ainda não têm nota
+        com_nota = {row[0] for row in notas_aluno}
+        for disciplina, (presencas, aulas) in sorted(frequencias.items()):
+            if disciplina in com_nota:
+                continue
+            tree_notas.insert('', 'end', values=(disciplina, '-', formatar_frequencia(presencas, aulas),
+                                                 '-', 'Em andamento'))
         
         # ========== CÁLCULO E EXIBIÇÃO DA MÉDIA GERAL ==========
         if count > 0:
@@ -759,9 +2042,22 @@ class InterfacePrincipal:
         Permite que outro usuário faça login sem fechar o programa.
         """
         self.janela.destroy()  # Destroi a janela atual
-        InterfaceLogin(self.sistema)  # Abre novamente a tela de login
+        InterfaceLogin(self.roteador)  # Abre novamente a tela de login
 
 # Iniciar aplicação
 if __name__ == "__main__":
-    sistema = SistemaNotas()
-    InterfaceLogin(sistema)
+    roteador = RoteadorEscolas()
+    if '--snapshot' in sys.argv:
+        # Uso periódico (ex: agendado): python sistemas_notas.py --snapshot
+        for escola in roteador.escolas():
+            relidas = SnapshotNotas(roteador.pasta_snapshot(escola)).exportar(roteador.sistema(escola))
+            print(f"{escola}: snapshot atualizado, {relidas} nota(s) relida(s) do banco.")
+        roteador.fechar_todos()
+    elif '--rede' in sys.argv:
+        # Relatório da rede: tamanho de cada banco e médias de todas as escolas
+        for escola, tamanho in roteador.tamanhos().items():
+            print(f"{escola}: {tamanho / 1024:.1f} KB")
+        for disciplina, media in roteador.medias_rede().items():
+            print(f"{disciplina}: média {media:.2f}")
+    else:
+        InterfaceLogin(roteador)
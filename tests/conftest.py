@@ -0,0 +1,43 @@
+"""
+Fixtures dos testes da lógica do sistema (sem interface gráfica).
+
+Cada teste recebe um banco em memória novo, copiado do banco modelo com a
+API de backup do SQLite, então os testes são independentes e podem rodar
+em paralelo:  python -m pytest -n auto
+"""
+
+from collections import namedtuple
+
+import pytest
+
+from sistemas_notas import SistemaNotas
+
+IdsEscola = namedtuple('IdsEscola', ['professor', 'aluno'])
+
+
+@pytest.fixture
+def sistema():
+    """Sistema com banco em memória vazio (só o usuário secretaria padrão)"""
+    sistema = SistemaNotas.em_memoria()
+    yield sistema
+    sistema.fechar()
+
+
+@pytest.fixture
+def ids(sistema):
+    """
+    Cadastra uma escola pequena no `sistema` e retorna os ids {nome: id}:
+    - professores: Ana (Matemática), Bruno (Matemática), Carla (Português)
+    - alunos: Davi e Eva na turma 1A, Fábio na turma 2B
+    """
+    sistema.cadastrar_professor('Ana', 'Matemática', 'ana', 'senha')
+    sistema.cadastrar_professor('Bruno', 'Matemática', 'bruno', 'senha')
+    sistema.cadastrar_professor('Carla', 'Português', 'carla', 'senha')
+    sistema.cadastrar_aluno('Davi', '1A', 'davi', 'senha')
+    sistema.cadastrar_aluno('Eva', '1A', 'eva', 'senha')
+    sistema.cadastrar_aluno('Fábio', '2B', 'fabio', 'senha')
+
+    return IdsEscola(
+        professor={nome: id_ for id_, _, nome, _ in sistema.listar_professores()},
+        aluno={nome: id_ for id_, _, nome, _ in sistema.listar_alunos()},
+    )
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from sistemas_notas import ESCOLA_PADRAO, RoteadorEscolas, SistemaNotas
+
+
+@pytest.fixture
+def roteador(tmp_path):
+    return RoteadorEscolas(pasta=tmp_path / 'escolas',
+                           banco_padrao=str(tmp_path / 'sistema_notas.db'),
+                           tempo_ocioso=0.05)
+
+
+def test_sem_escolas_usa_banco_padrao(roteador):
+    assert list(roteador.escolas()) == [ESCOLA_PADRAO]
+
+
+def test_adicionar_escola_mantem_banco_padrao(roteador):
+    # Instalação antiga com dados no banco único
+    antigo = roteador.sistema(ESCOLA_PADRAO)
+    antigo.cadastrar_aluno('Davi', '1A', 'davi', 'senha')
+
+    roteador.adicionar_escola('centro')
+
+    assert list(roteador.escolas()) == [ESCOLA_PADRAO, 'centro']
+    assert roteador.entrar(ESCOLA_PADRAO, 'davi', 'senha') is not None
+    assert roteador.entrar('centro', 'davi', 'senha') is None
+
+
+def test_nomes_de_escola_invalidos(roteador):
+    roteador.adicionar_escola('centro')
+    for nome in ['centro', ESCOLA_PADRAO, 'com espaço', '../fora']:
+        with pytest.raises(ValueError):
+            roteador.adicionar_escola(nome)
+
+
+def test_conexao_ociosa_fecha_e_reabre(roteador):
+    roteador.adicionar_escola('centro')
+    sistema = roteador.sistema('centro')
+    sistema.cadastrar_aluno('Davi', '1A', 'davi', 'senha')
+
+    time.sleep(0.1)
+    roteador.fechar_ociosos()
+    assert not sistema.conectado()
+
+    # Quem guardou o objeto continua usando normalmente
+    assert sistema.listar_turmas() == ['1A']
+    assert roteador.sistema('centro') is sistema
+
+
+def test_conexao_em_uso_nao_fecha(roteador):
+    roteador.adicionar_escola('centro')
+    sistema = roteador.sistema('centro')
+    time.sleep(0.1)
+    sistema.listar_turmas()      # uso recente
+    roteador.fechar_ociosos()
+    assert sistema.conectado()
+
+
+def test_relatorio_da_rede_junta_as_escolas(roteador):
+    for nome, notas in [('centro', [4.0, 6.0]), ('norte', [8.0])]:
+        roteador.adicionar_escola(nome)
+        sistema = roteador.sistema(nome)
+        sistema.cadastrar_professor('Ana', 'Matemática', 'ana', 'senha')
+        prof_id = sistema.listar_professores()[0][0]
+        for i, nota in enumerate(notas):
+            sistema.cadastrar_aluno(f'Aluno {i}', '1A', f'aluno{i}', 'senha')
+            aluno_id = sistema.listar_alunos()[0][0]
+            sistema.lancar_nota(aluno_id, 'Matemática', prof_id, nota)
+
+    assert roteador.medias_rede() == {'Matemática': 6.0}
+    tamanhos = roteador.tamanhos()
+    assert set(tamanhos) == {'centro', 'norte'}
+    assert all(tamanho > 0 for tamanho in tamanhos.values())
+
+
+def test_banco_em_memoria_nao_reabre():
+    sistema = SistemaNotas.em_memoria()
+    sistema.fechar()
+    with pytest.raises(Exception):
+        sistema.listar_turmas()
+
+
+def test_relatorio_da_rede_em_instalacao_nova(roteador):
+    # 'principal' é listada, mas o banco ainda não existe
+    assert roteador.medias_rede() == {}
+    assert roteador.consultar_rede('SELECT 1') == {}
@@ -0,0 +1,78 @@
+import pytest
+
+from sistemas_notas import contar_presencas, formatar_frequencia, situacao_final
+
+
+def test_contar_presencas():
+    assert contar_presencas(b'') == 0
+    assert contar_presencas(bytes([0b1011, 0xFF])) == 11
+
+
+def test_chamada_numera_aulas_pela_turma(sistema, ids):
+    davi, eva = ids.aluno['Davi'], ids.aluno['Eva']
+    assert sistema.registrar_chamada('1A', 'Matemática', {davi: True, eva: True}) == 0
+    assert sistema.registrar_chamada('1A', 'Matemática', {davi: True, eva: False}) == 1
+    assert sistema.proxima_aula('1A', 'Matemática') == 2
+    assert sistema.frequencias_turma('1A', 'Matemática') == {davi: (2, 2), eva: (1, 2)}
+
+
+def test_aluno_novo_nao_leva_falta_das_aulas_anteriores(sistema, ids):
+    davi = ids.aluno['Davi']
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True})
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True})
+
+    nova = sistema.cadastrar_aluno('Gil', '1A', 'gil', 'senha')
+    gil = [a[0] for a in sistema.listar_alunos() if a[1] == nova][0]
+    assert sistema.registrar_chamada('1A', 'Matemática', {davi: True, gil: True}) == 2
+
+    assert sistema.frequencias_aluno(gil) == {'Matemática': (1, 1)}
+    assert sistema.frequencias_aluno(davi) == {'Matemática': (3, 3)}
+
+
+def test_corrigir_aula_antiga_nao_conta_para_aluno_novo(sistema, ids):
+    davi = ids.aluno['Davi']
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True})
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True})
+
+    nova = sistema.cadastrar_aluno('Gil', '1A', 'gil', 'senha')
+    gil = [a[0] for a in sistema.listar_alunos() if a[1] == nova][0]
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True, gil: True})
+
+    # A tela de chamada manda a turma inteira ao corrigir a aula 1
+    sistema.registrar_chamada('1A', 'Matemática', {davi: False, gil: True}, aula=0)
+
+    assert sistema.frequencias_aluno(gil) == {'Matemática': (1, 1)}
+    assert sistema.frequencias_aluno(davi) == {'Matemática': (2, 3)}
+    assert sistema.chamada_registrada('1A', 'Matemática', 0) == {davi: False}
+
+
+def test_corrigir_chamada_de_aula_anterior(sistema, ids):
+    davi = ids.aluno['Davi']
+    sistema.registrar_chamada('1A', 'Matemática', {davi: False})
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True})
+
+    assert sistema.chamada_registrada('1A', 'Matemática', 0) == {davi: False}
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True}, aula=0)
+    assert sistema.chamada_registrada('1A', 'Matemática', 0) == {davi: True}
+    assert sistema.proxima_aula('1A', 'Matemática') == 2
+
+
+def test_chamada_nao_pula_aulas(sistema, ids):
+    with pytest.raises(ValueError):
+        sistema.registrar_chamada('1A', 'Matemática', {ids.aluno['Davi']: True}, aula=3)
+
+
+def test_periodos_sao_separados(sistema, ids):
+    davi = ids.aluno['Davi']
+    sistema.registrar_chamada('1A', 'Matemática', {davi: True}, periodo='2025.1')
+    assert sistema.proxima_aula('1A', 'Matemática', periodo='2025.2') == 0
+    assert sistema.frequencias_aluno(davi, periodo='2025.2') == {}
+
+
+def test_situacao_final_exige_nota_e_frequencia():
+    assert situacao_final(8.0, 0, 0) == 'Aprovado'
+    assert situacao_final(8.0, 3, 4) == 'Aprovado'
+    assert situacao_final(8.0, 2, 4) == 'Reprovado'
+    assert situacao_final(5.0, 4, 4) == 'Reprovado'
+    assert formatar_frequencia(3, 4) == '75.0%'
+    assert formatar_frequencia(0, 0) == '-'
@@ -0,0 +1,79 @@
+import pytest
+
+
+def test_lancar_nota_insere_e_depois_atualiza(sistema, ids):
+    davi, ana = ids.aluno['Davi'], ids.professor['Ana']
+    assert sistema.lancar_nota(davi, 'Matemática', ana, 7.0) is True
+    assert sistema.lancar_nota(davi, 'Matemática', ana, 8.5) is False
+    assert sistema.notas_do_aluno(davi) == [('Matemática', 8.5, 'Ana')]
+
+
+@pytest.mark.parametrize('nota', [-1, 10.5])
+def test_lancar_nota_fora_da_faixa(sistema, ids, nota):
+    with pytest.raises(ValueError):
+        sistema.lancar_nota(ids.aluno['Davi'], 'Matemática', ids.professor['Ana'], nota)
+
+
+def test_notas_da_disciplina_inclui_alunos_sem_nota(sistema, ids):
+    sistema.lancar_nota(ids.aluno['Eva'], 'Português', ids.professor['Carla'], 9.0)
+    linhas = {row[1]: row[3] for row in sistema.notas_da_disciplina('Português', ids.professor['Carla'])}
+    assert linhas == {'Davi': '-', 'Eva': 9.0, 'Fábio': '-'}
+
+
+def test_matriz_tem_uma_coluna_por_professor(sistema, ids):
+    davi = ids.aluno['Davi']
+    sistema.lancar_nota(davi, 'Matemática', ids.professor['Ana'], 4.0)
+    sistema.lancar_nota(davi, 'Matemática', ids.professor['Bruno'], 8.0)
+
+    alunos, colunas, valores = sistema.buscar_matriz_notas('1A')
+
+    assert [a[2] for a in alunos] == ['Davi', 'Eva']
+    assert colunas == [
+        ('Matemática', ids.professor['Ana'], 'Ana', True),
+        ('Matemática', ids.professor['Bruno'], 'Bruno', True),
+        ('Português', ids.professor['Carla'], 'Carla', True)]
+    assert valores[0] == [4.0, 8.0, None]
+    assert valores[1] == [None, None, None]
+
+
+def test_matriz_da_escola_inteira(sistema, ids):
+    alunos, _, _ = sistema.buscar_matriz_notas()
+    assert [a[2] for a in alunos] == ['Davi', 'Eva', 'Fábio']
+
+
+def test_salvar_lote_altera_apenas_o_professor_da_coluna(sistema, ids):
+    davi, eva = ids.aluno['Davi'], ids.aluno['Eva']
+    ana, bruno = ids.professor['Ana'], ids.professor['Bruno']
+    sistema.lancar_nota(davi, 'Matemática', ana, 4.0)
+    sistema.lancar_nota(davi, 'Matemática', bruno, 8.0)
+
+    sistema.salvar_notas_lote({
+        (davi, 'Matemática', ana): 9.0,     # atualiza só a nota da Ana
+        (eva, 'Matemática', bruno): 6.5,    # insere em nome do Bruno
+    })
+
+    _, _, valores = sistema.buscar_matriz_notas('1A')
+    assert valores[0][:2] == [9.0, 8.0]
+    assert valores[1][:2] == [None, 6.5]
+
+
+def test_salvar_lote_invalido_nao_grava_nada(sistema, ids):
+    davi, ana = ids.aluno['Davi'], ids.professor['Ana']
+    with pytest.raises(ValueError):
+        sistema.salvar_notas_lote({(davi, 'Matemática', ana): 7.0,
+                                  (davi, 'Português', ids.professor['Carla']): 11.0})
+    assert sistema.notas_do_aluno(davi) == []
+
+
+def test_professor_excluido_fica_so_leitura(sistema, ids):
+    eva, ana = ids.aluno['Eva'], ids.professor['Ana']
+    sistema.lancar_nota(ids.aluno['Davi'], 'Matemática', ana, 5.0)
+    sistema.excluir_professor(ana)
+
+    _, colunas, valores = sistema.buscar_matriz_notas('1A')
+    assert colunas[0] == ('Matemática', ana, '(excluído)', False)
+    assert valores[0][0] == 5.0
+
+    with pytest.raises(ValueError):
+        sistema.salvar_notas_lote({(eva, 'Matemática', ana): 7.0})
+    assert sistema.buscar_matriz_notas('1A')[2][1][0] is None
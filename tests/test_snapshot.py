@@ -0,0 +1,65 @@
+import sqlite3
+
+import pytest
+
+from sistemas_notas import SistemaNotas, SnapshotNotas
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def com_notas(sistema, ids):
+    """Notas de Matemática (Ana): Davi 4, Eva 8, Fábio 6"""
+    for nome, nota in [('Davi', 4.0), ('Eva', 8.0), ('Fábio', 6.0)]:
+        sistema.lancar_nota(ids.aluno[nome], 'Matemática', ids.professor['Ana'], nota)
+
+
+def test_exportacao_completa_e_leitura(sistema, com_notas, tmp_path):
+    snapshot = SnapshotNotas(tmp_path / 'snap')
+    assert snapshot.exportar(sistema) == 3
+
+    dados = snapshot.carregar()
+    assert isinstance(dados['nota'], np.memmap)
+    assert dados['nota'].dtype == np.float32
+    assert SnapshotNotas.medias(dados, 'turma') == {'1A': 6.0, '2B': 6.0}
+    assert SnapshotNotas.medias(dados, 'professor') == {'Ana': 6.0}
+
+
+def test_exportacao_incremental(sistema, ids, com_notas, tmp_path):
+    snapshot = SnapshotNotas(tmp_path / 'snap')
+    snapshot.exportar(sistema)
+    assert snapshot.exportar(sistema) == 0
+
+    sistema.lancar_nota(ids.aluno['Davi'], 'Matemática', ids.professor['Ana'], 10.0)
+    sistema.excluir_aluno(ids.aluno['Fábio'])
+    assert snapshot.exportar(sistema) == 1
+
+    dados = snapshot.carregar()
+    assert sorted(dados['nota'].tolist()) == [8.0, 10.0]
+    assert SnapshotNotas.medias(dados, 'turma') == {'1A': 9.0}
+
+
+def test_registro_de_alteracoes_so_existe_com_snapshot(sistema, com_notas, tmp_path):
+    assert not sistema.registro_alteracoes_ativo()
+    SnapshotNotas(tmp_path / 'snap').exportar(sistema)
+    assert sistema.registro_alteracoes_ativo()
+
+
+def test_registro_grande_demais_e_descartado(sistema, ids, com_notas, tmp_path, monkeypatch):
+    banco = tmp_path / 'escola.db'
+    sistema.conn.backup(sqlite3.connect(banco))
+    em_arquivo = SistemaNotas(banco)
+    snapshot = SnapshotNotas(tmp_path / 'snap')
+    snapshot.exportar(em_arquivo)
+
+    em_arquivo.lancar_nota(ids.aluno['Eva'], 'Matemática', ids.professor['Ana'], 2.0)
+    em_arquivo.lancar_nota(ids.aluno['Davi'], 'Matemática', ids.professor['Ana'], 3.0)
+    em_arquivo.fechar()
+
+    monkeypatch.setattr(SistemaNotas, 'LIMITE_REGISTRO_ALTERACOES', 0)
+    em_arquivo = SistemaNotas(banco)
+    assert not em_arquivo.registro_alteracoes_ativo()
+
+    # Sem o registro, o próximo snapshot é refeito por completo
+    assert snapshot.exportar(em_arquivo) == 3
+    assert sorted(snapshot.carregar()['nota'].tolist()) == [2.0, 3.0, 6.0]
@@ -0,0 +1,76 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from sistemas_notas import SistemaNotas
+
+
+def test_secretaria_padrao_autentica(sistema):
+    assert sistema.autenticar('secretaria', 'secretaria123')
+    assert sistema.tipo_usuario == 'secretaria'
+
+
+def test_senha_errada_nao_autentica(sistema):
+    assert not sistema.autenticar('secretaria', 'errada')
+    assert sistema.usuario_logado is None
+
+
+def test_gerar_matricula_sequencial(sistema):
+    ano = datetime.now().year
+    assert sistema.gerar_matricula() == f"{ano}001"
+    assert sistema.cadastrar_aluno('Davi', '1A', 'davi', 'senha') == f"{ano}001"
+    assert sistema.cadastrar_aluno('Eva', '1A', 'eva', 'senha') == f"{ano}002"
+    assert sistema.gerar_matricula() == f"{ano}003"
+
+
+def test_gerar_codigo_professor_sequencial(sistema):
+    assert sistema.cadastrar_professor('Ana', 'Matemática', 'ana', 'senha') == 'PROF001'
+    assert sistema.gerar_codigo_professor() == 'PROF002'
+
+
+def test_aluno_cadastrado_faz_login_como_aluno(sistema):
+    sistema.cadastrar_aluno('Davi', '1A', 'davi', 'senha')
+    assert sistema.autenticar('davi', 'senha')
+    assert sistema.tipo_usuario == 'aluno'
+    _, nome, _, turma = sistema.buscar_aluno(sistema.usuario_logado)
+    assert (nome, turma) == ('Davi', '1A')
+
+
+def test_professor_cadastrado_faz_login_como_professor(sistema):
+    sistema.cadastrar_professor('Ana', 'Matemática', 'ana', 'senha')
+    assert sistema.autenticar('ana', 'senha')
+    assert sistema.tipo_usuario == 'professor'
+    assert sistema.buscar_professor(sistema.usuario_logado)[1:] == ('Ana', 'Matemática')
+
+
+def test_usuario_repetido_nao_grava_nada(sistema):
+    sistema.cadastrar_aluno('Davi', '1A', 'davi', 'senha')
+    with pytest.raises(sqlite3.IntegrityError):
+        sistema.cadastrar_aluno('Outro Davi', '2B', 'davi', 'senha')
+    assert [a[2] for a in sistema.listar_alunos()] == ['Davi']
+
+
+def test_excluir_aluno_e_professor(sistema, ids):
+    sistema.excluir_aluno(ids.aluno['Davi'])
+    sistema.excluir_professor(ids.professor['Carla'])
+    assert 'Davi' not in [a[2] for a in sistema.listar_alunos()]
+    assert 'Carla' not in [p[2] for p in sistema.listar_professores()]
+
+
+def test_bancos_em_memoria_sao_isolados():
+    primeiro = SistemaNotas.em_memoria()
+    primeiro.cadastrar_aluno('Davi', '1A', 'davi', 'senha')
+    assert SistemaNotas.em_memoria().listar_alunos() == []
+
+
+def test_aceita_pathlib_e_uri(tmp_path):
+    arquivo = SistemaNotas(tmp_path / 'escola.db')
+    assert arquivo.autenticar('secretaria', 'secretaria123')
+
+    uri = f"file:{tmp_path.name}?mode=memory&cache=shared"
+    compartilhado = SistemaNotas(uri)
+    outra_conexao = sqlite3.connect(uri, uri=True)
+    assert outra_conexao.execute('SELECT COUNT(*) FROM usuarios').fetchone() == (1,)
+    outra_conexao.close()
+    compartilhado.fechar()